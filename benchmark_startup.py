@@ -0,0 +1,126 @@
+"""
+Benchmark server startup: import time of main.py and first-request latency.
+
+Each measurement runs in a fresh Python process so nothing is already imported or loaded.
+First-request latency (opening a folder, searching, and tagging an image with Ollama)
+is measured with and without background model warm-up:
+
+    python benchmark_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+IMPORT_SNIPPET = """
+import json, time
+started = time.perf_counter()
+import main
+print(json.dumps({"import_seconds": time.perf_counter() - started}))
+"""
+
+FIRST_REQUEST_SNIPPET = """
+import json, os, struct, sys, tempfile, time, zlib
+from pathlib import Path
+from fastapi.testclient import TestClient
+import main
+
+def write_noise_png(path, size=128):
+    # Random pixels keep the PNG above ImageProcessor's 40kb "too small" cutoff
+    rows = b"".join(b"\\x00" + os.urandom(size * 3) for _ in range(size))
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+    path.write_bytes(b"\\x89PNG\\r\\n\\x1a\\n"
+                     + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+                     + chunk(b"IDAT", zlib.compress(rows))
+                     + chunk(b"IEND", b""))
+
+def component_status(client, component):
+    return client.get("/ready").json()["components"][component]["status"]
+
+wait_for_warm_up = sys.argv[1] == "1"
+
+with tempfile.TemporaryDirectory() as tmp, TestClient(main.app) as client:
+    folder = Path(tmp)
+    write_noise_png(folder / "sample.png")
+
+    if wait_for_warm_up:
+        # Give the background warm-up time to load both models, as a deploy would
+        deadline = time.perf_counter() + 300
+        while (any(component_status(client, c) not in ("ready", "failed")
+                   for c in ("embedding_model", "vision_model"))
+               and time.perf_counter() < deadline):
+            time.sleep(0.1)
+
+    started = time.perf_counter()
+    client.post("/images", json={"folder_path": str(folder)}).raise_for_status()
+    images_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    client.post("/search", json={"query": "sample"}).raise_for_status()
+    search_seconds = time.perf_counter() - started
+
+    # Time the first tagging request unless Ollama is known to be unavailable;
+    # a failed request (e.g. the cold load exceeding the client timeout) is reported as null
+    process_seconds = None
+    if component_status(client, "vision_model") != "failed":
+        started = time.perf_counter()
+        response = client.post("/process-image", json={"image_path": "sample.png"})
+        if response.status_code == 200:
+            process_seconds = time.perf_counter() - started
+
+    print(json.dumps({
+        "first_images_seconds": images_seconds,
+        "first_search_seconds": search_seconds,
+        "first_process_image_seconds": process_seconds,
+        "readiness": client.get("/ready").json()["components"]
+    }))
+"""
+
+def run_snippet(snippet: str, *args: str, warmup: bool = True) -> dict:
+    """Run a snippet in a fresh interpreter from the repo root and parse its JSON output."""
+    env = dict(os.environ, WARMUP_MODELS="1" if warmup else "0")
+    result = subprocess.run(
+        [sys.executable, "-c", snippet, *args],
+        cwd=Path(__file__).parent,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def summarize(values: list) -> Optional[dict]:
+    """Return median/min/max of a list of durations in milliseconds, ignoring skipped runs."""
+    values = [value for value in values if value is not None]
+    if not values:
+        return None
+    return {
+        "median_ms": round(statistics.median(values) * 1000, 1),
+        "min_ms": round(min(values) * 1000, 1),
+        "max_ms": round(max(values) * 1000, 1)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark import time and first-request latency.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement")
+    args = parser.parse_args()
+
+    import_runs = [run_snippet(IMPORT_SNIPPET)["import_seconds"] for _ in range(args.runs)]
+    report = {"import_main": summarize(import_runs)}
+
+    for label, warmup in (("cold", False), ("warmed", True)):
+        runs = [run_snippet(FIRST_REQUEST_SNIPPET, "1" if warmup else "0", warmup=warmup)
+                for _ in range(args.runs)]
+        report[f"first_request_{label}"] = {
+            "post_images": summarize([r["first_images_seconds"] for r in runs]),
+            "post_search": summarize([r["first_search_seconds"] for r in runs]),
+            "post_process_image": summarize([r["first_process_image_seconds"] for r in runs]),
+            "readiness": runs[-1]["readiness"]
+        }
+
+    print(json.dumps(report, indent=4))
@@ -1,15 +1,28 @@
-import ollama
 from pathlib import Path
 import logging
-from typing import Dict, List, Optional
+import os
+from typing import Dict, List, Optional, Set
 import json
 from pydantic import BaseModel
 import asyncio
-import httpx
 import base64
 
 logger = logging.getLogger(__name__)
 
+# httpx is imported lazily so that importing this module (and main.py) stays cheap.
+
+OLLAMA_URL = "http://localhost:11434"
+
+# How long Ollama keeps the vision model loaded after a request
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+
+# Vision models that have answered a request (warm-up or tagging) in this process
+_loaded_models: Set[str] = set()
+
+def is_model_loaded(model_name: str) -> bool:
+    """Return whether the vision model has been loaded by a successful Ollama request."""
+    return model_name in _loaded_models
+
 class ImageDescription(BaseModel):
     description: str
 
@@ -24,6 +37,23 @@ class ImageProcessor:
     def __init__(self, model_name: str = 'llama3.2-vision'):
         self.model_name = model_name
 
+    async def warm_up(self) -> None:
+        """
+        Load the vision model into Ollama without generating anything.
+        keep_alive keeps it resident so the first tagging request skips the cold load.
+        """
+        import httpx
+
+        # Errors propagate to the caller, which records and logs them
+        async with httpx.AsyncClient(timeout=300.0) as client:
+            response = await client.post(
+                url=f"{OLLAMA_URL}/api/generate",
+                json={"model": self.model_name, "keep_alive": OLLAMA_KEEP_ALIVE}
+            )
+            response.raise_for_status()
+        _loaded_models.add(self.model_name)
+        logger.info(f"Vision model {self.model_name} loaded (keep_alive={OLLAMA_KEEP_ALIVE})")
+
     async def process_image(self, image_path: Path) -> Dict:
         """
         Process an image using Ollama vision model to generate tags, description, and extract text.
@@ -116,6 +146,8 @@ class ImageProcessor:
 
     async def _query_ollama(self, prompt: str, image_path: str, format_schema: dict) -> str:
         """Send a POST request to Ollama with a base64-encoded image and expect structured output."""
+        import httpx
+
         try:
             # Read and encode the image in base64
             with open(image_path, "rb") as image_file:
@@ -136,16 +168,18 @@ class ImageProcessor:
                         "images": [image_b64]
                     }
                 ],
-                "format": format_schema
+                "format": format_schema,
+                "keep_alive": OLLAMA_KEEP_ALIVE
             }
 
             # Send the POST request with a timeout
             async with httpx.AsyncClient(timeout=15.0) as client:
                 response = await client.post(
-                    url="http://localhost:11434/api/chat",
+                    url=f"{OLLAMA_URL}/api/chat",
                     json=payload
                 )
                 response.raise_for_status()
+                _loaded_models.add(self.model_name)
                 return response.json()['message']['content']
 
         except httpx.TimeoutException:
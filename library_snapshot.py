@@ -0,0 +1,232 @@
+"""
+Export and import portable snapshots of a library's vector store.
+
+A snapshot is a directory holding:
+- `embeddings.npy`: float32 matrix of the stored embedding vectors (memory-mappable)
+- `records.json`: ids, documents, metadata and content hashes, row-aligned with the vectors
+
+Importing a snapshot bulk-loads the stored vectors straight into ChromaDB,
+so no document is passed through the embedding function again. Each row carries
+hashes of its document and its vector bytes plus a fingerprint of its image file
+(size and first/last block): a corrupt snapshot is rejected, and entries whose image
+is missing or changed on the target are skipped.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+EMBEDDINGS_FILE = "embeddings.npy"
+RECORDS_FILE = "records.json"
+DEFAULT_SNAPSHOT_DIR = "library_snapshot"
+BATCH_SIZE = 1000
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+def content_hash(document: str) -> str:
+    """Return the SHA-256 hex digest of an embedded document."""
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+def vector_hash(vector) -> str:
+    """Return the SHA-256 hex digest of a float32 embedding row."""
+    return hashlib.sha256(vector.tobytes()).hexdigest()
+
+def image_fingerprint(image_path: Path) -> Optional[str]:
+    """
+    Return a cheap fingerprint of an image file (size plus SHA-256 of its first and
+    last block), or None if it does not exist. Reading whole images would make
+    export and import scale with the size of the photo library.
+    """
+    if not image_path.is_file():
+        return None
+    size = image_path.stat().st_size
+    digest = hashlib.sha256()
+    with open(image_path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_BLOCK_SIZE))
+        if size > FINGERPRINT_BLOCK_SIZE:
+            f.seek(max(size - FINGERPRINT_BLOCK_SIZE, FINGERPRINT_BLOCK_SIZE))
+            digest.update(f.read())
+    return f"{size}:{digest.hexdigest()}"
+
+def restore_metadata_file(folder_path: Path, restored: Dict[str, Dict]) -> None:
+    """
+    Merge restored entries into the folder's image_metadata.json. Entries that are
+    missing or unprocessed there are filled from the snapshot, so the next folder
+    sync keeps the restored tags instead of re-embedding empty metadata over them.
+    """
+    metadata_file = folder_path / "image_metadata.json"
+    if metadata_file.exists():
+        with open(metadata_file, 'r') as f:
+            all_metadata = json.load(f)
+    else:
+        all_metadata = {}
+
+    for image_path, metadata in restored.items():
+        if not all_metadata.get(image_path, {}).get("is_processed"):
+            all_metadata[image_path] = metadata
+
+    with open(metadata_file, 'w') as f:
+        json.dump(all_metadata, f, indent=4)
+
+def _throughput(count: int, started: float) -> Dict:
+    """Build the stats dict reported by export and import."""
+    seconds = time.perf_counter() - started
+    return {
+        "count": count,
+        "seconds": round(seconds, 3),
+        "records_per_second": round(count / seconds, 1) if seconds > 0 else None
+    }
+
+def export_snapshot(vector_store: VectorStore, folder_path: Path, snapshot_dir: Path) -> Dict:
+    """Write all entries of the vector store, including embeddings, to a snapshot directory."""
+    import numpy as np
+
+    started = time.perf_counter()
+    try:
+        total = vector_store.collection.count()
+        ids: List[str] = []
+        documents: List[str] = []
+        metadatas: List[Dict] = []
+        vectors = []
+
+        # Page through the collection to keep memory bounded on large libraries
+        for offset in range(0, total, BATCH_SIZE):
+            batch = vector_store.collection.get(
+                limit=BATCH_SIZE,
+                offset=offset,
+                include=['documents', 'metadatas', 'embeddings']
+            )
+            ids.extend(batch['ids'])
+            documents.extend(batch['documents'])
+            metadatas.extend(batch['metadatas'])
+            if len(batch['ids']):
+                vectors.append(np.asarray(batch['embeddings'], dtype=np.float32))
+
+        embeddings = np.concatenate(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        np.save(snapshot_dir / EMBEDDINGS_FILE, embeddings)
+        with open(snapshot_dir / RECORDS_FILE, 'w') as f:
+            json.dump({
+                "version": SNAPSHOT_VERSION,
+                "dimension": int(embeddings.shape[1]),
+                "ids": ids,
+                "documents": documents,
+                "metadatas": metadatas,
+                "content_hashes": [content_hash(document) for document in documents],
+                "vector_hashes": [vector_hash(vector) for vector in embeddings],
+                "image_fingerprints": [image_fingerprint(folder_path / doc_id) for doc_id in ids]
+            }, f)
+
+        stats = _throughput(len(ids), started)
+        logger.info(f"Exported {stats['count']} entries to {snapshot_dir} in {stats['seconds']}s "
+                    f"({stats['records_per_second']} records/s)")
+        return stats
+
+    except Exception as e:
+        logger.error(f"Error exporting snapshot: {str(e)}")
+        raise
+
+def import_snapshot(vector_store: VectorStore, folder_path: Path, snapshot_dir: Path) -> Dict:
+    """
+    Replace the vector store contents with a snapshot without re-embedding any document,
+    and restore the matching entries in the folder's image_metadata.json.
+    """
+    import numpy as np
+
+    started = time.perf_counter()
+    try:
+        records_file = snapshot_dir / RECORDS_FILE
+        embeddings_file = snapshot_dir / EMBEDDINGS_FILE
+        if not records_file.exists() or not embeddings_file.exists():
+            raise FileNotFoundError(f"Snapshot not found: {snapshot_dir}")
+
+        with open(records_file, 'r') as f:
+            records = json.load(f)
+        if records.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {records.get('version')}")
+
+        ids = records["ids"]
+        documents = records["documents"]
+        metadatas = records["metadatas"]
+        content_hashes = records["content_hashes"]
+        vector_hashes = records["vector_hashes"]
+        image_fingerprints = records["image_fingerprints"]
+        embeddings = np.load(embeddings_file, mmap_mode='r')
+
+        columns = (documents, metadatas, content_hashes, vector_hashes, image_fingerprints)
+        if len(ids) != embeddings.shape[0] or any(len(column) != len(ids) for column in columns):
+            raise ValueError("Snapshot records and embeddings are not aligned")
+        if len(ids) and embeddings.shape[1] != records.get("dimension"):
+            raise ValueError(f"Snapshot embeddings have dimension {embeddings.shape[1]}, "
+                             f"expected {records.get('dimension')}")
+
+        # Refuse a snapshot whose documents or vectors do not match the exported hashes,
+        # and skip entries whose image is missing or has changed on this machine
+        keep = []
+        for row, doc_id in enumerate(ids):
+            if content_hash(documents[row]) != content_hashes[row]:
+                raise ValueError(f"Content hash mismatch for: {doc_id}")
+            if vector_hash(embeddings[row]) != vector_hashes[row]:
+                raise ValueError(f"Embedding hash mismatch for: {doc_id}")
+            if image_fingerprint(folder_path / doc_id) != image_fingerprints[row]:
+                logger.warning(f"Skipping snapshot entry with missing or changed image: {doc_id}")
+                continue
+            keep.append(row)
+
+        # Load into a staging collection so a failed batch leaves the live collection intact
+        staging = vector_store.create_staging_collection()
+        try:
+            for start in range(0, len(keep), BATCH_SIZE):
+                rows = keep[start:start + BATCH_SIZE]
+                staging.add(
+                    ids=[ids[row] for row in rows],
+                    documents=[documents[row] for row in rows],
+                    metadatas=[metadatas[row] for row in rows],
+                    embeddings=np.ascontiguousarray(embeddings[rows])
+                )
+        except Exception:
+            logger.error("Snapshot load failed, discarding staging collection; existing entries were kept")
+            vector_store.drop_staging_collection()
+            raise
+        vector_store.replace_collection(staging)
+        restore_metadata_file(folder_path, {
+            ids[row]: VectorStore.decode_metadata(metadatas[row]) for row in keep
+        })
+
+        stats = _throughput(len(keep), started)
+        stats["skipped"] = len(ids) - len(keep)
+        logger.info(f"Imported {stats['count']} entries ({stats['skipped']} skipped) from {snapshot_dir} "
+                    f"in {stats['seconds']}s ({stats['records_per_second']} records/s)")
+        return stats
+
+    except Exception as e:
+        logger.error(f"Error importing snapshot: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Export or import a library's vector store snapshot.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command in ("export", "import"):
+        subparser = subparsers.add_parser(command, help=f"{command.capitalize()} a snapshot")
+        subparser.add_argument("folder", type=Path, help="Image folder containing the .vectordb")
+        subparser.add_argument("--snapshot", type=Path, default=None,
+                               help=f"Snapshot directory (default: <folder>/{DEFAULT_SNAPSHOT_DIR})")
+    args = parser.parse_args()
+
+    snapshot_dir = args.snapshot or args.folder / DEFAULT_SNAPSHOT_DIR
+    store = VectorStore(persist_directory=str(args.folder / ".vectordb"))
+    if args.command == "export":
+        result = export_snapshot(store, args.folder, snapshot_dir)
+    else:
+        result = import_snapshot(store, args.folder, snapshot_dir)
+    print(json.dumps(result, indent=4))
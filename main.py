@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
@@ -8,15 +9,56 @@ from pathlib import Path
 from typing import List, Dict, Set, Optional
 import json
 import logging
-from image_processor import ImageProcessor, update_image_metadata
-from vector_store import VectorStore
-
-app = FastAPI()
+import asyncio
+import shutil
+import time
+from image_processor import ImageProcessor, is_model_loaded, update_image_metadata
+from vector_store import (VectorStore, clear_client_cache, get_embedding_function,
+                          is_embedding_function_loaded, warm_up_embedding_function)
+from library_snapshot import export_snapshot, import_snapshot, DEFAULT_SNAPSHOT_DIR
+
+# Warm the embedding and vision models in the background on startup (set to "0" to disable)
+WARMUP_MODELS = os.environ.get("WARMUP_MODELS", "1") != "0"
+
+async def warm_up(component: str, warm_up_fn) -> None:
+    """Run a warm-up coroutine and record its outcome in app.readiness."""
+    app.readiness[component] = {"status": "warming"}
+    started = time.perf_counter()
+    try:
+        await warm_up_fn()
+        app.readiness[component] = {
+            "status": "ready",
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+    except Exception as e:
+        logger.error(f"Warm-up of {component} failed: {str(e)}")
+        app.readiness[component] = {"status": "failed", "error": str(e)}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background model warm-up without delaying server startup."""
+    tasks = []
+    if WARMUP_MODELS:
+        tasks = [
+            asyncio.create_task(warm_up(
+                "embedding_model", lambda: asyncio.get_running_loop().run_in_executor(None, warm_up_embedding_function))),
+            asyncio.create_task(warm_up(
+                "vision_model", lambda: ImageProcessor().warm_up()))
+        ]
+    yield
+    for task in tasks:
+        task.cancel()
+
+app = FastAPI(lifespan=lifespan)
 
 # Mount static files (your frontend)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 app.current_folder = ""
 app.images = []
+app.readiness = {
+    "embedding_model": {"status": "cold"},
+    "vision_model": {"status": "cold"}
+}
 
 # We don't need CORS middleware anymore since frontend and backend are served from same origin
 # app.add_middleware(CORSMiddleware, ...)
@@ -51,6 +93,13 @@ class UpdateImageMetadata(BaseModel):
     tags: Optional[List[str]] = None
     text_content: Optional[str] = None
 
+class SnapshotRequest(BaseModel):
+    snapshot_path: Optional[str] = None
+
+class ImportSnapshotRequest(BaseModel):
+    folder_path: str
+    snapshot_path: Optional[str] = None
+
 def get_supported_extensions() -> Set[str]:
     """Return a set of supported image file extensions."""
     return {'.jpg', '.jpeg', '.png', '.webp'}
@@ -196,7 +245,9 @@ async def get_images(request: FolderRequest):
     try:
         # Initialize vector store in the selected folder
         vector_store_path = folder_path / ".vectordb"
-        app.vector_store = VectorStore(persist_directory=str(vector_store_path))
+        # Built off the event loop: it may wait on the embedding model warm-up
+        app.vector_store = await asyncio.get_running_loop().run_in_executor(
+            None, VectorStore, str(vector_store_path))
         
         metadata = load_or_create_metadata(folder_path)
         app.images = [create_image_info(rel_path, metadata) 
@@ -331,6 +382,103 @@ async def update_metadata(request: UpdateImageMetadata):
         logger.error(f"Error updating metadata: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error updating metadata: {str(e)}")
 
+def resolve_snapshot_dir(folder_path: Path, snapshot_path: Optional[str]) -> Path:
+    """Return the requested snapshot directory, defaulting to one inside the image folder."""
+    if snapshot_path:
+        return Path(snapshot_path)
+    return folder_path / DEFAULT_SNAPSHOT_DIR
+
+def open_vector_store_for_restore(folder_path: Path) -> VectorStore:
+    """Open the folder's vector store, moving an unreadable .vectordb aside so it can be rebuilt."""
+    vector_store_path = folder_path / ".vectordb"
+
+    # Load the embedding model before touching the directory: if that fails (e.g. offline
+    # without a cached model), the store is fine and must not be moved aside
+    get_embedding_function()
+
+    try:
+        return VectorStore(persist_directory=str(vector_store_path))
+    except Exception as e:
+        damaged_path = folder_path / f".vectordb.damaged-{int(time.time())}"
+        logger.error(f"Vector store at {vector_store_path} is unreadable ({str(e)}), moving it to {damaged_path}")
+        shutil.move(str(vector_store_path), str(damaged_path))
+
+        # ChromaDB caches the failed system for this path; clearing the cache also stops the
+        # open folder's client, so close that folder and let the next POST /images reopen it
+        clear_client_cache()
+        app.current_folder = ""
+        app.images = []
+        if hasattr(app, 'vector_store'):
+            del app.vector_store
+
+        return VectorStore(persist_directory=str(vector_store_path))
+
+@app.post("/export-snapshot")
+async def export_snapshot_endpoint(request: SnapshotRequest):
+    """Export the vector store, including embeddings, to a portable snapshot."""
+    if not hasattr(app, 'current_folder') or not hasattr(app, 'vector_store'):
+        raise HTTPException(status_code=400, detail="No folder selected")
+
+    try:
+        snapshot_dir = resolve_snapshot_dir(Path(app.current_folder), request.snapshot_path)
+        # Run off the event loop so other requests (e.g. /ready) are served meanwhile
+        stats = await asyncio.get_running_loop().run_in_executor(
+            None, export_snapshot, app.vector_store, Path(app.current_folder), snapshot_dir)
+        return {"snapshot_path": str(snapshot_dir), **stats}
+
+    except Exception as e:
+        logger.error(f"Error exporting snapshot: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error exporting snapshot: {str(e)}")
+
+@app.post("/import-snapshot")
+async def import_snapshot_endpoint(request: ImportSnapshotRequest):
+    """
+    Restore a folder's vector store from a snapshot without re-embedding documents.
+    Call this before opening the folder with POST /images, so the sync that runs
+    there finds the restored entries unchanged instead of embedding everything.
+    """
+    folder_path = Path(request.folder_path)
+    if not folder_path.exists() or not folder_path.is_dir():
+        raise HTTPException(status_code=404, detail="Folder not found")
+
+    snapshot_dir = resolve_snapshot_dir(folder_path, request.snapshot_path)
+    if not snapshot_dir.exists():
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+    try:
+        loop = asyncio.get_running_loop()
+        vector_store = await loop.run_in_executor(None, open_vector_store_for_restore, folder_path)
+        stats = await loop.run_in_executor(None, import_snapshot, vector_store, folder_path, snapshot_dir)
+
+        # Keep an already opened folder pointing at the restored store
+        if app.current_folder == str(folder_path) and hasattr(app, 'vector_store'):
+            app.vector_store = vector_store
+
+        return {"snapshot_path": str(snapshot_dir), **stats}
+
+    except Exception as e:
+        logger.error(f"Error importing snapshot: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error importing snapshot: {str(e)}")
+
+@app.get("/ready")
+async def readiness():
+    """
+    Report which models are loaded. Warm-up results are kept for detail, but a model
+    loaded later by a request (warm-up disabled or failed) is reported as ready too.
+    """
+    components = dict(app.readiness)
+    loaded = {
+        "embedding_model": is_embedding_function_loaded(),
+        "vision_model": is_model_loaded(ImageProcessor().model_name)
+    }
+    for component, is_loaded in loaded.items():
+        if is_loaded and components[component]["status"] != "ready":
+            components[component] = {"status": "ready"}
+    return {
+        "ready": all(c["status"] == "ready" for c in components.values()),
+        "components": components
+    }
+
 @app.get("/check-init-status")
 async def check_init_status():
     """Check if this is the first time initialization."""
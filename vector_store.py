@@ -1,39 +1,117 @@
-import chromadb
-from chromadb.utils import embedding_functions
-from chromadb.config import Settings
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# chromadb is imported lazily so that importing this module (and main.py) stays cheap.
+
+_embedding_function = None
+_embedding_function_lock = threading.Lock()
+
+def get_embedding_function():
+    """
+    Return the process-wide embedding function, shared by all vector stores.
+    The first caller builds it and loads the model under a lock, so the startup
+    warm-up and an early request never download or load the model twice.
+    """
+    global _embedding_function
+    with _embedding_function_lock:
+        if _embedding_function is None:
+            from chromadb.utils import embedding_functions
+
+            # Use ChromaDB's default embedding function all-MiniLM-L6-v2
+            embedding_function = embedding_functions.DefaultEmbeddingFunction()
+            embedding_function(["warm-up"])  # Downloads and loads the ONNX model
+            _embedding_function = embedding_function
+        return _embedding_function
+
+def is_embedding_function_loaded() -> bool:
+    """Return whether the embedding model has been loaded, by warm-up or by a request."""
+    return _embedding_function is not None
+
+def warm_up_embedding_function() -> None:
+    """Load the embedding model ahead of time, so later queries skip the cold start."""
+    get_embedding_function()
+
+def clear_client_cache() -> None:
+    """
+    Drop ChromaDB's per-path cache of client systems. A system that failed to open
+    stays cached, so a store cannot be reopened at the same path until this is called.
+    This also stops every other open client in the process.
+    """
+    from chromadb.api.client import SharedSystemClient
+
+    SharedSystemClient.clear_system_cache()
+
 class VectorStore:
     def __init__(self, persist_directory: str = ".vectordb"):
         """Initialize ChromaDB client with persistence."""
+        import chromadb
+        from chromadb.config import Settings
+
+        # Load the embedding model first, so a model failure is never mistaken for a storage error
+        self.embedding_function = get_embedding_function()
+
         self.client = chromadb.PersistentClient(path=persist_directory, settings=Settings(anonymized_telemetry=False))
         
-        # Use ChromaDB's default embedding function all-MiniLM-L6-v2
-        self.embedding_function = embedding_functions.DefaultEmbeddingFunction()
-        
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
             name="image_metadata",
             embedding_function=self.embedding_function
         )
 
+    @staticmethod
+    def _prepare_entry(metadata: Dict) -> Tuple[str, Dict]:
+        """Build the document text and ChromaDB metadata dict for an image."""
+        # Combine all text fields for embedding
+        text_to_embed = f"{metadata.get('description', '')} {' '.join(metadata.get('tags', []))} {metadata.get('text_content', '')}"
+        
+        # Prepare metadata dict
+        meta_dict = {
+            "description": metadata.get("description", ""),
+            "tags": ",".join(metadata.get("tags", [])),  # ChromaDB metadata must be string
+            "text_content": metadata.get("text_content", ""),
+            "is_processed": str(metadata.get("is_processed", False))  # Convert bool to string
+        }
+        return text_to_embed, meta_dict
+
+    def create_staging_collection(self):
+        """Create an empty collection to bulk-load into before replacing the live one."""
+        try:
+            self.client.delete_collection(name="image_metadata_staging")
+        except Exception:
+            pass  # No leftover staging collection from an earlier failed load
+        return self.client.create_collection(
+            name="image_metadata_staging",
+            embedding_function=self.embedding_function
+        )
+
+    def drop_staging_collection(self) -> None:
+        """Delete the staging collection after a failed load, leaving the live one untouched."""
+        self.client.delete_collection(name="image_metadata_staging")
+
+    def replace_collection(self, staging) -> None:
+        """Swap a fully loaded staging collection in as the live collection."""
+        self.client.delete_collection(name="image_metadata")
+        staging.modify(name="image_metadata")
+        self.collection = staging
+
+    @staticmethod
+    def decode_metadata(metadata: Dict) -> Dict:
+        """Convert a stored ChromaDB metadata dict back to the image_metadata.json format."""
+        return {
+            "description": metadata.get("description", ""),
+            "tags": metadata.get("tags", "").split(",") if metadata.get("tags") else [],
+            "text_content": metadata.get("text_content", ""),
+            "is_processed": metadata.get("is_processed", "False") == "True"
+        }
+
     def add_or_update_image(self, image_path: str, metadata: Dict) -> None:
         """Add or update image metadata in the vector store."""
         try:
-            # Combine all text fields for embedding
-            text_to_embed = f"{metadata.get('description', '')} {' '.join(metadata.get('tags', []))} {metadata.get('text_content', '')}"
-            
-            # Prepare metadata dict
-            meta_dict = {
-                "description": metadata.get("description", ""),
-                "tags": ",".join(metadata.get("tags", [])),  # ChromaDB metadata must be string
-                "text_content": metadata.get("text_content", ""),
-                "is_processed": str(metadata.get("is_processed", False))  # Convert bool to string
-            }
+            text_to_embed, meta_dict = self._prepare_entry(metadata)
             
             # Check if document exists
             results = self.collection.get(
@@ -73,8 +151,14 @@ class VectorStore:
         """Synchronize vector store with metadata JSON."""
         try:
             # Get all existing documents in vector store
-            existing_docs = self.collection.get()
+            existing_docs = self.collection.get(include=['documents', 'metadatas'])
             existing_ids = set(existing_docs['ids']) if existing_docs else set()
+            existing_entries = {
+                doc_id: (document, meta)
+                for doc_id, document, meta in zip(
+                    existing_docs['ids'], existing_docs['documents'], existing_docs['metadatas']
+                )
+            } if existing_docs else {}
             
             # Get all ids from metadata
             metadata_ids = set(metadata.keys())
@@ -84,8 +168,11 @@ class VectorStore:
             if ids_to_delete:
                 self.collection.delete(ids=list(ids_to_delete))
             
-            # Add or update documents from metadata
+            # Add or update documents from metadata, skipping unchanged entries
+            # so a restored snapshot is not re-embedded on the next folder open
             for image_path, meta in metadata.items():
+                if existing_entries.get(image_path) == self._prepare_entry(meta):
+                    continue
                 self.add_or_update_image(image_path, meta)
                 
             logger.info("Successfully synchronized vector store with metadata")
@@ -99,13 +186,7 @@ class VectorStore:
         try:
             result = self.collection.get(ids=[image_path])
             if result and result['metadatas']:
-                metadata = result['metadatas'][0]
-                return {
-                    "description": metadata.get("description", ""),
-                    "tags": metadata.get("tags", "").split(",") if metadata.get("tags") else [],
-                    "text_content": metadata.get("text_content", ""),
-                    "is_processed": metadata.get("is_processed", "False") == "True"
-                }
+                return self.decode_metadata(result['metadatas'][0])
             return None
         except Exception as e:
             logger.error(f"Error retrieving metadata from vector store: {str(e)}")